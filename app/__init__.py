@@ -64,7 +64,36 @@ app.config.update(
     SESSION_COOKIE_HTTPONLY=True,
     SESSION_COOKIE_SAMESITE='Lax',
     PERMANENT_SESSION_LIFETIME=60 * 60 * 8,   # 8 h
+    # Static assets and templates never change between deploys, so let
+    # browsers cache /static/* for an hour and skip Jinja's per-request
+    # template mtime checks.
+    SEND_FILE_MAX_AGE_DEFAULT=3600,
+    TEMPLATES_AUTO_RELOAD=False,
 )
+app.jinja_env.auto_reload = False
+
+# Optional faster JSON encoder.  The dashboard polls /api/ais/logs and
+# /api/ais/endpoints every tick; orjson encodes those dict-of-dicts
+# payloads several times faster than the stdlib provider.  Not a hard
+# dependency — wheels aren't guaranteed on every Pi OS image — so the
+# stdlib provider remains the fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class _OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _OrjsonProvider(app)
+
 
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
@@ -10,12 +10,14 @@
 from __future__ import annotations
 
 import configparser
+import hashlib
 import ipaddress
 import logging
 import os
 import re
 import shutil
 import socket
+import threading
 from datetime import datetime
 from typing import List, Optional, Tuple
 
@@ -73,18 +75,51 @@ def _valid_port(port) -> Optional[int]:
 # ---------------------------------------------------------------------------
 # Atomic load / save
 # ---------------------------------------------------------------------------
+# Parsed-config cache, invalidated by mtime.  The forwarder thread and the
+# web routes both call :func:`load_ais_config` repeatedly; the file only
+# changes when an admin edits an endpoint, so re-parsing on every call is
+# wasted work.  Callers receive a per-call copy because several of them
+# mutate the returned dict before saving.
+_cache_lock = threading.Lock()
+_cache: dict = {'mtime_ns': None, 'config': None}
+
+
+def _copy_config(config: dict) -> dict:
+    return {section: dict(values) for section, values in config.items()}
+
+
+def _invalidate_cache() -> None:
+    with _cache_lock:
+        _cache['mtime_ns'] = None
+        _cache['config'] = None
+
+
 def load_ais_config() -> dict | None:
     if not os.path.exists(CONFIG_FILE):
         create_default_config()
 
+    try:
+        mtime_ns = os.stat(CONFIG_FILE).st_mtime_ns
+    except OSError as exc:
+        log.error("Failed to stat %s: %s", CONFIG_FILE, exc)
+        return None
+
+    with _cache_lock:
+        if _cache['mtime_ns'] == mtime_ns and _cache['config'] is not None:
+            return _copy_config(_cache['config'])
+
     parser = configparser.ConfigParser()
     try:
         parser.read(CONFIG_FILE)
-        return {section: dict(parser.items(section))
-                for section in parser.sections()}
     except (configparser.Error, OSError) as exc:
         log.error("Failed to load %s: %s", CONFIG_FILE, exc)
         return None
+    config = {section: dict(parser.items(section))
+              for section in parser.sections()}
+    with _cache_lock:
+        _cache['mtime_ns'] = mtime_ns
+        _cache['config'] = config
+    return _copy_config(config)
 
 
 def create_default_config() -> bool:
@@ -109,6 +144,7 @@ def _atomic_write(parser: configparser.ConfigParser) -> bool:
             f.flush()
             os.fsync(f.fileno())
         os.replace(tmp, CONFIG_FILE)
+        _invalidate_cache()
         return True
     except OSError as exc:
         log.error("Atomic write of %s failed: %s", CONFIG_FILE, exc)
@@ -123,11 +159,28 @@ def backup_config() -> Optional[str]:
     if not os.path.exists(CONFIG_FILE):
         return None
     try:
-        ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+        with open(CONFIG_FILE, 'rb') as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
         backup_dir = os.path.join(os.path.dirname(CONFIG_FILE), 'backups')
         os.makedirs(backup_dir, exist_ok=True)
+        # Skip the copy if this exact content is already the latest backup
+        # (e.g. a save that changed nothing) — no point writing another
+        # timestamped duplicate.
+        marker = os.path.join(backup_dir, '.last_hash')
+        try:
+            with open(marker) as f:
+                if f.read().strip() == digest:
+                    return None
+        except OSError:
+            pass
+        ts = datetime.now().strftime('%Y%m%d_%H%M%S')
         backup_file = os.path.join(backup_dir, f'ais_config_{ts}.conf')
         shutil.copy2(CONFIG_FILE, backup_file)
+        try:
+            with open(marker, 'w') as f:
+                f.write(digest)
+        except OSError:
+            pass
         _prune_backups(backup_dir)
         return backup_file
     except OSError as exc:
@@ -156,10 +209,24 @@ def _prune_backups(backup_dir: str) -> None:
 def save_ais_config(config_dict: dict) -> Tuple[bool, str]:
     backup_file = backup_config()
     parser = configparser.ConfigParser()
-    for section, values in config_dict.items():
-        parser[section] = {k: str(v) for k, v in values.items()}
+    # Normalised copy (str values, lower-case option keys — matching what
+    # configparser would hand back on the next read).
+    normalised = {section: {k.lower(): str(v) for k, v in values.items()}
+                  for section, values in config_dict.items()}
+    for section, values in normalised.items():
+        parser[section] = values
     if not _atomic_write(parser):
         return False, "Error saving config"
+    # Seed the cache with what we just wrote — the UI re-lists endpoints
+    # immediately after every save, so this spares the reparse.
+    try:
+        mtime_ns = os.stat(CONFIG_FILE).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if mtime_ns is not None:
+        with _cache_lock:
+            _cache['mtime_ns'] = mtime_ns
+            _cache['config'] = normalised
     return True, ("Configuration saved (backup: "
                   f"{os.path.basename(backup_file) if backup_file else 'none'})")
 
@@ -176,22 +243,50 @@ def get_all_endpoints() -> List[dict]:
         if section.startswith('ENDPOINT_'):
             ep = dict(values)
             ep['id'] = section
+            # Typed once here so renderers don't re-do the string compare
+            # per row.  Derived field only — never written back to disk.
+            ep['enabled_bool'] = ep.get('enabled', 'true') == 'true'
             out.append(ep)
     return out
 
 
 def _next_endpoint_id(config: dict) -> str:
-    nums = []
-    for section in config:
-        if section.startswith('ENDPOINT_'):
-            try:
-                nums.append(int(section.split('_', 1)[1]))
-            except (IndexError, ValueError):
-                pass
-    return f"ENDPOINT_{(max(nums) + 1) if nums else 1}"
-
-
-def add_endpoint(name: str, ip: str, port, enabled: bool = True):
+    """Allocate the next ``ENDPOINT_N`` id from a monotonic counter kept
+    in ``[AIS] next_endpoint_id`` (persisted with the save that follows).
+
+    The counter means deleting endpoint 5 and adding a new one never
+    reuses 5 — stale references held elsewhere (live connections, open
+    browser tabs) can't silently point at the wrong endpoint.  Configs
+    written before the counter existed are seeded from a one-time scan.
+    """
+    ais = config.setdefault('AIS', {})
+    try:
+        nxt = int(ais.get('next_endpoint_id', 0))
+    except (TypeError, ValueError):
+        nxt = 0
+    if nxt < 1:
+        nums = []
+        for section in config:
+            if section.startswith('ENDPOINT_'):
+                try:
+                    nums.append(int(section.split('_', 1)[1]))
+                except (IndexError, ValueError):
+                    pass
+        nxt = (max(nums) + 1) if nums else 1
+    # Belt-and-braces against a hand-edited / rolled-back counter.
+    while f"ENDPOINT_{nxt}" in config:
+        nxt += 1
+    ais['next_endpoint_id'] = str(nxt + 1)
+    return f"ENDPOINT_{nxt}"
+
+
+def _valid_protocol(protocol) -> Optional[str]:
+    p = (protocol or 'tcp').strip().lower()
+    return p if p in ('tcp', 'udp') else None
+
+
+def add_endpoint(name: str, ip: str, port, enabled: bool = True,
+                 protocol: str = 'tcp'):
     if not name:
         return False, None, "Name is required"
     p = _valid_port(port)
@@ -199,21 +294,29 @@ def add_endpoint(name: str, ip: str, port, enabled: bool = True):
         return False, None, "Port must be 1–65535"
     if not _valid_host(ip):
         return False, None, "Invalid IP address or hostname"
+    proto = _valid_protocol(protocol)
+    if proto is None:
+        return False, None, "Protocol must be 'tcp' or 'udp'"
 
     config = load_ais_config() or {'AIS': {'serial_port': '/dev/serial0',
                                            'baud_rate': '38400'}}
     eid = _next_endpoint_id(config)
     config[eid] = {
-        'name':    name.strip(),
-        'ip':      ip.strip(),
-        'port':    str(p),
-        'enabled': str(bool(enabled)).lower(),
+        'name':     name.strip(),
+        'ip':       ip.strip(),
+        'port':     str(p),
+        'protocol': proto,
+        'enabled':  str(bool(enabled)).lower(),
     }
     ok, msg = save_ais_config(config)
     return (ok, eid if ok else None, msg)
 
 
-def update_endpoint(endpoint_id: str, name: str, ip: str, port, enabled):
+def update_endpoint(endpoint_id: str, name: str, ip: str, port, enabled,
+                    protocol: Optional[str] = None):
+    """Update an endpoint.  ``protocol=None`` keeps the stored value, so
+    callers that don't surface the field (CLI edit, older UI) can't
+    silently flip a UDP endpoint back to TCP."""
     config = load_ais_config()
     if not config or endpoint_id not in config:
         return False, "Endpoint not found"
@@ -222,12 +325,18 @@ def update_endpoint(endpoint_id: str, name: str, ip: str, port, enabled):
         return False, "Port must be 1–65535"
     if not _valid_host(ip):
         return False, "Invalid IP address or hostname"
+    if protocol is None:
+        protocol = config[endpoint_id].get('protocol', 'tcp')
+    proto = _valid_protocol(protocol)
+    if proto is None:
+        return False, "Protocol must be 'tcp' or 'udp'"
 
     config[endpoint_id] = {
-        'name':    (name or '').strip(),
-        'ip':      ip.strip(),
-        'port':    str(p),
-        'enabled': str(bool(enabled)).lower(),
+        'name':     (name or '').strip(),
+        'ip':       ip.strip(),
+        'port':     str(p),
+        'protocol': proto,
+        'enabled':  str(bool(enabled)).lower(),
     }
     return save_ais_config(config)
 
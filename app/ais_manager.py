@@ -58,41 +58,56 @@ def _tag_block(source_id: str) -> bytes:
 
 def _looks_like_valid_nmea(line: bytes) -> bool:
     """True if *line* parses as ``!AIVDM…*HH`` or ``$AIVDO…*HH`` and the
-    checksum matches.  Tolerant of CR/LF and tag-blocks."""
-    try:
-        text = line.decode("ascii", errors="strict").rstrip("\r\n")
-    except UnicodeDecodeError:
-        return False
+    checksum matches.  Works on the raw bytes — NMEA is 7-bit ASCII, so
+    there is no reason to decode every sentence just to validate it.
+    Tolerant of CR/LF and tag-blocks."""
+    text = line.rstrip(b"\r\n")
     # Strip optional tag-block.
-    if text.startswith("\\"):
-        end = text.find("\\", 1)
+    if text.startswith(b"\\"):
+        end = text.find(b"\\", 1)
         if end == -1:
             return False
         text = text[end + 1:]
-    if not text or text[0] not in "!$":
+    if not text or text[:1] not in (b"!", b"$"):
         return False
-    star = text.rfind("*")
+    star = text.rfind(b"*")
     if star < 0 or star + 3 != len(text):
         return False
-    body = text[1:star]
-    given = text[star + 1:].upper()
-    return _nmea_checksum(body) == given
+    cs = 0
+    for b in text[1:star]:
+        if b < 0x20 or b > 0x7E:     # non-printable → line noise, not NMEA
+            return False
+        cs ^= b
+    try:
+        given = int(text[star + 1:], 16)
+    except ValueError:
+        return False
+    return cs == given
 
 
 # ---------------------------------------------------------------------------
 # Persistent TCP endpoint
 # ---------------------------------------------------------------------------
 class EndpointConnection:
-    """Long-lived TCP sender for a single endpoint.  Thread-safe."""
+    """Long-lived TCP sender for a single endpoint.  Thread-safe.
+
+    Sends are non-blocking: data the kernel can't accept right now (peer's
+    receive window full, Wi-Fi hiccup) is parked in a bounded pending
+    buffer and flushed on the next send, so one stalled endpoint never
+    holds up the fan-out to the others.  Only (backoff-rate-limited)
+    reconnect attempts still block, for at most *connect_timeout*.
+    """
 
     def __init__(self, name, host, port,
-                 logger_cb=None,
-                 connect_timeout=5.0, send_timeout=5.0):
+                 logger_cb=None, protocol="tcp",
+                 connect_timeout=5.0, max_pending=64 * 1024):
         self.name = name
         self.host = host
         self.port = int(port)
+        self.protocol = protocol
         self.connect_timeout = connect_timeout
-        self.send_timeout = send_timeout
+        self._max_pending = max_pending
+        self._pending = bytearray()
         self._sock: Optional[socket.socket] = None
         self._lock = threading.Lock()
         self._backoff = 1.0
@@ -140,6 +155,8 @@ class EndpointConnection:
 
     def _connect(self) -> bool:
         self._close()
+        if self.protocol == "udp":
+            return self._connect_udp()
         try:
             s = socket.create_connection((self.host, self.port),
                                          timeout=self.connect_timeout)
@@ -164,8 +181,29 @@ class EndpointConnection:
                         pass
         except OSError:
             pass
-        s.settimeout(self.send_timeout)
+        s.setblocking(False)
+        self._sock = s
+        self._pending.clear()
+        self._backoff = 1.0
+        self._next_retry_at = 0.0
+        self._set_state(True)
+        return True
+
+    def _connect_udp(self) -> bool:
+        """Connected SOCK_DGRAM socket — resolves/pins the destination once
+        so each batch goes out as a single connection-less datagram."""
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.connect((self.host, self.port))
+        except (OSError, socket.gaierror) as exc:
+            self.failed_count += 1
+            self._set_state(False, str(exc))
+            self._next_retry_at = time.time() + self._backoff
+            self._backoff = min(self._backoff * 2, self._backoff_max)
+            return False
+        s.setblocking(False)
         self._sock = s
+        self._pending.clear()
         self._backoff = 1.0
         self._next_retry_at = 0.0
         self._set_state(True)
@@ -179,22 +217,37 @@ class EndpointConnection:
                     return False
                 if not self._connect():
                     return False
+            self._pending += data
+            if len(self._pending) > self._max_pending:
+                # Peer has stopped reading — drop the oldest data, cutting
+                # on a sentence boundary so at most one line is mangled
+                # (and that one fails the receiver's checksum).
+                cut = len(self._pending) - self._max_pending
+                nl = self._pending.find(b"\n", cut)
+                del self._pending[:cut if nl < 0 else nl + 1]
             try:
-                self._sock.sendall(data)
-                self.sent_count += 1
-                self.connected = True
-                return True
+                while self._pending:
+                    n = self._sock.send(self._pending)
+                    del self._pending[:n]
+            except (BlockingIOError, InterruptedError):
+                # Kernel buffer full; the rest goes out on the next call.
+                pass
             except OSError as exc:
                 self.failed_count += 1
                 self._set_state(False, str(exc))
                 self._close()
+                self._pending.clear()
                 self._next_retry_at = time.time() + self._backoff
                 self._backoff = min(self._backoff * 2, self._backoff_max)
                 return False
+            self.sent_count += 1
+            self.connected = True
+            return True
 
     def close(self):
         with self._lock:
             self._close()
+            self._pending.clear()
             self._set_state(False, "closed")
 
 
@@ -208,11 +261,18 @@ class AISManager:
         self.serial_port = "/dev/serial0"
         self.baud_rate = 38400
         self.node_id = ""
+        self._tag_prefix = b""      # tag block bytes, rebuilt on config load
         self.endpoints: list[dict] = []
         self.connections: dict[str, EndpointConnection] = {}
         self.endpoint_status: dict[str, dict] = {}
         self.logs: deque[dict] = deque(maxlen=200)
+        # Two locks: `lock` guards the connection/endpoint set (held across
+        # config reload + socket teardown), `_log_lock` only the log deque —
+        # so log writes/reads never wait on a reload in progress.
+        # `endpoint_status` needs neither: it is replaced wholesale by a
+        # single dict rebind, which is atomic under the GIL.
         self.lock = threading.Lock()
+        self._log_lock = threading.Lock()
         # Stats.
         self.lines_seen = 0
         self.lines_invalid = 0
@@ -230,16 +290,22 @@ class AISManager:
         except (TypeError, ValueError):
             self.baud_rate = 38400
         self.node_id = (ais.get('node_id') or '').strip()
+        # Checksummed once here, not per sentence.
+        self._tag_prefix = _tag_block(self.node_id)
 
         endpoints = []
         for section, vals in config.items():
             if section.startswith('ENDPOINT_') and vals.get('enabled', 'false').lower() == 'true':
+                protocol = (vals.get('protocol') or 'tcp').lower()
+                if protocol not in ('tcp', 'udp'):
+                    protocol = 'tcp'
                 endpoints.append({
-                    'id':      section,
-                    'name':    vals.get('name', section),
-                    'ip':      vals.get('ip', ''),
-                    'port':    int(vals.get('port', 0) or 0),
-                    'enabled': True,
+                    'id':       section,
+                    'name':     vals.get('name', section),
+                    'ip':       vals.get('ip', ''),
+                    'port':     int(vals.get('port', 0) or 0),
+                    'protocol': protocol,
+                    'enabled':  True,
                 })
         return endpoints
 
@@ -255,7 +321,8 @@ class AISManager:
         for eid, ep in wanted.items():
             existing = self.connections.get(eid)
             if existing and (existing.host != ep['ip']
-                             or existing.port != int(ep['port'])):
+                             or existing.port != int(ep['port'])
+                             or existing.protocol != ep.get('protocol', 'tcp')):
                 existing.close()
                 existing = None
             if existing is None:
@@ -263,6 +330,7 @@ class AISManager:
                     name=ep['name'],
                     host=ep['ip'],
                     port=int(ep['port']),
+                    protocol=ep.get('protocol', 'tcp'),
                     logger_cb=self.add_log,
                 )
         self._refresh_status_mirror()
@@ -350,7 +418,7 @@ class AISManager:
 
     # ------------------------------------------------------------------
     def add_log(self, level, message):
-        with self.lock:
+        with self._log_lock:
             self.logs.append({
                 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 'level':     level,
@@ -360,7 +428,7 @@ class AISManager:
         getattr(log, str(level).lower(), log.info)(message)
 
     def get_logs(self, count=100):
-        with self.lock:
+        with self._log_lock:
             if count >= len(self.logs):
                 return list(self.logs)
             return list(self.logs)[-count:]
@@ -375,12 +443,12 @@ class AISManager:
             body = line + b"\n"
         else:
             body = line + b"\r\n"
-        if self.node_id:
-            return _tag_block(self.node_id) + body
+        if self._tag_prefix:
+            return self._tag_prefix + body
         return body
 
-    def _broadcast(self, line: bytes) -> None:
-        payload = self._build_payload(line)
+    def _broadcast(self, lines: list[bytes]) -> None:
+        payload = b"".join(self._build_payload(line) for line in lines)
         for c in self.connections.values():
             c.send(payload)
 
@@ -421,26 +489,44 @@ class AISManager:
                         except serial.SerialException as exc:
                             self.add_log("ERROR", f"Serial read error: {exc}")
                             break
-                        except UnicodeDecodeError:
-                            continue
 
                         if not line:
                             continue
 
-                        self.lines_seen += 1
-                        # NMEA checksum filter: bad → drop, count, never forward.
-                        if not _looks_like_valid_nmea(line):
-                            self.lines_invalid += 1
+                        # Drain whatever further sentences the kernel has
+                        # already buffered (AIS bursts arrive in packs) so
+                        # the whole group goes out in one send() per
+                        # endpoint rather than one syscall per sentence.
+                        batch = [line]
+                        while len(batch) < 16 and ser.in_waiting:
+                            try:
+                                extra = ser.readline()
+                            except serial.SerialException:
+                                break
+                            if not extra:
+                                break
+                            batch.append(extra)
+
+                        valid = []
+                        for item in batch:
+                            self.lines_seen += 1
+                            # NMEA checksum filter: bad → drop, count,
+                            # never forward.
+                            if not _looks_like_valid_nmea(item):
+                                self.lines_invalid += 1
+                                continue
+                            valid.append(item)
+                        if not valid:
                             continue
                         if not first_seen:
-                            preview = line.decode('ascii', errors='ignore').strip()[:60]
+                            preview = valid[0].decode('ascii', errors='ignore').strip()[:60]
                             self.add_log("INFO",
                                          f"Receiving valid AIS data (first: {preview})")
                             first_seen = True
 
                         try:
-                            self._broadcast(line)
-                            self.lines_forwarded += 1
+                            self._broadcast(valid)
+                            self.lines_forwarded += len(valid)
                         except Exception as exc:  # noqa: BLE001
                             self.add_log("ERROR", f"Broadcast error: {exc}")
 
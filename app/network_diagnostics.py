@@ -1,125 +1,166 @@
-"""Network diagnostics: ping + interface status + signal/DNS/gateway.
-
-Same hardening as :mod:`app.wifi_manager` — no ``shell=True`` anywhere.
-"""
-from __future__ import annotations
-
-import logging
-import re
-
-from app._shellutil import run_args
-
-log = logging.getLogger(__name__)
-
-
-# ---------------------------------------------------------------------------
-# Ping
-# ---------------------------------------------------------------------------
-def ping_test(host: str = "8.8.8.8", count: int = 4) -> dict:
-    if not host or any(c.isspace() for c in host):
-        return {"success": False, "host": host, "output": "invalid host"}
-    try:
-        count = max(1, min(int(count), 20))
-    except (TypeError, ValueError):
-        count = 4
-
-    out, err, rc = run_args(
-        ["ping", "-c", str(count), "-W", "2", host],
-        timeout=count * 3 + 5,
-    )
-    result = {
-        "success": rc == 0,
-        "host": host,
-        "output": out if rc == 0 else (err or out),
-    }
-    if rc == 0:
-        m = re.search(r"(\d+)% packet loss", out)
-        if m:
-            result["packet_loss"] = m.group(1) + "%"
-        m = re.search(r"min/avg/max/(?:mdev|stddev) = "
-                      r"([\d.]+)/([\d.]+)/([\d.]+)/[\d.]+ ms", out)
-        if m:
-            result["min_time"] = m.group(1) + " ms"
-            result["avg_time"] = m.group(2) + " ms"
-            result["max_time"] = m.group(3) + " ms"
-    return result
-
-
-# ---------------------------------------------------------------------------
-# Interfaces
-# ---------------------------------------------------------------------------
-def _iface_status(name: str) -> dict:
-    out, _err, rc = run_args(["ip", "link", "show", name])
-    if rc != 0:
-        return {"status": "Not found", "exists": False}
-    return {
-        "status": "UP" if "state UP" in out else "DOWN",
-        "exists": True,
-    }
-
-
-def get_interface_status() -> dict:
-    return {iface: _iface_status(iface) for iface in ("wlan0", "wlan1")}
-
-
-# ---------------------------------------------------------------------------
-# Connection stats / DNS / gateway
-# ---------------------------------------------------------------------------
-def get_connection_stats() -> dict:
-    stats: dict = {}
-    out, _err, rc = run_args([
-        "nmcli", "-t", "-f",
-        "GENERAL.STATE,GENERAL.CONNECTION,IP4.ADDRESS,SIGNAL",
-        "device", "show", "wlan0",
-    ])
-    if rc == 0:
-        for line in out.splitlines():
-            if ":" not in line:
-                continue
-            key, _, value = line.partition(":")
-            value = value.strip()
-            if "STATE" in key:
-                stats["state"] = value
-            elif "CONNECTION" in key:
-                stats["connection"] = value
-            elif "IP4.ADDRESS" in key:
-                stats["ip_address"] = value
-    out, _err, rc = run_args(["iwconfig", "wlan0"])
-    if rc == 0:
-        m = re.search(r"Signal level[=:](-?\d+)", out)
-        if m:
-            stats["signal_strength"] = m.group(1) + " dBm"
-    return stats
-
-
-def get_gateway() -> str:
-    out, _err, rc = run_args(["ip", "route", "show", "default"])
-    if rc == 0 and out.strip():
-        for line in out.splitlines():
-            tok = line.split()
-            if "via" in tok:
-                return tok[tok.index("via") + 1]
-    return "Unknown"
-
-
-def get_dns_servers() -> list:
-    out, _err, rc = run_args([
-        "nmcli", "-t", "-f", "IP4.DNS", "device", "show", "wlan0",
-    ])
-    servers = []
-    if rc == 0:
-        for line in out.splitlines():
-            if "IP4.DNS" in line:
-                v = line.partition(":")[2].strip()
-                if v:
-                    servers.append(v)
-    return servers or ["None configured"]
-
-
-def get_full_diagnostics() -> dict:
-    return {
-        "interfaces": get_interface_status(),
-        "connection_stats": get_connection_stats(),
-        "gateway": get_gateway(),
-        "dns_servers": get_dns_servers(),
-    }
+"""Network diagnostics: ping + interface status + signal/DNS/gateway.
+
+Same hardening as :mod:`app.wifi_manager` — no ``shell=True`` anywhere.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+
+from app._shellutil import run_args
+
+log = logging.getLogger(__name__)
+
+# Compiled once — ping/iwconfig output is parsed on every diagnostics
+# call and re.search would re-hash the pattern each time.
+_LOSS_RE = re.compile(r"(\d+)% packet loss")
+_RTT_RE = re.compile(r"min/avg/max/(?:mdev|stddev) = "
+                     r"([\d.]+)/([\d.]+)/([\d.]+)/[\d.]+ ms")
+_SIGNAL_RE = re.compile(r"Signal level[=:](-?\d+)")
+
+
+# ---------------------------------------------------------------------------
+# Ping
+# ---------------------------------------------------------------------------
+def ping_test(host: str = "8.8.8.8", count: int = 4) -> dict:
+    if not host or any(c.isspace() for c in host):
+        return {"success": False, "host": host, "output": "invalid host"}
+    try:
+        count = max(1, min(int(count), 20))
+    except (TypeError, ValueError):
+        count = 4
+
+    out, err, rc = run_args(
+        ["ping", "-c", str(count), "-W", "2", host],
+        timeout=count * 3 + 5,
+    )
+    result = {
+        "success": rc == 0,
+        "host": host,
+        "output": out if rc == 0 else (err or out),
+    }
+    if rc == 0:
+        m = _LOSS_RE.search(out)
+        if m:
+            result["packet_loss"] = m.group(1) + "%"
+        m = _RTT_RE.search(out)
+        if m:
+            result["min_time"] = m.group(1) + " ms"
+            result["avg_time"] = m.group(2) + " ms"
+            result["max_time"] = m.group(3) + " ms"
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Interfaces
+# ---------------------------------------------------------------------------
+def _iface_status(name: str) -> dict:
+    # Sysfs answers this without forking `ip`; the subprocess path stays
+    # as a fallback for the (unlikely) case sysfs isn't readable.
+    try:
+        with open(f"/sys/class/net/{name}/operstate") as fh:
+            state = fh.read().strip()
+        return {"status": "UP" if state == "up" else "DOWN", "exists": True}
+    except OSError:
+        pass
+    out, _err, rc = run_args(["ip", "link", "show", name])
+    if rc != 0:
+        return {"status": "Not found", "exists": False}
+    return {
+        "status": "UP" if "state UP" in out else "DOWN",
+        "exists": True,
+    }
+
+
+def get_interface_status() -> dict:
+    return {iface: _iface_status(iface) for iface in ("wlan0", "wlan1")}
+
+
+# ---------------------------------------------------------------------------
+# Connection stats / DNS / gateway
+# ---------------------------------------------------------------------------
+def get_connection_stats() -> dict:
+    stats: dict = {}
+    out, _err, rc = run_args([
+        "nmcli", "-t", "-f",
+        "GENERAL.STATE,GENERAL.CONNECTION,IP4.ADDRESS,SIGNAL",
+        "device", "show", "wlan0",
+    ])
+    if rc == 0:
+        for line in out.splitlines():
+            if ":" not in line:
+                continue
+            key, _, value = line.partition(":")
+            value = value.strip()
+            if "STATE" in key:
+                stats["state"] = value
+            elif "CONNECTION" in key:
+                stats["connection"] = value
+            elif "IP4.ADDRESS" in key:
+                stats["ip_address"] = value
+    out, _err, rc = run_args(["iwconfig", "wlan0"])
+    if rc == 0:
+        m = _SIGNAL_RE.search(out)
+        if m:
+            stats["signal_strength"] = m.group(1) + " dBm"
+    return stats
+
+
+def get_gateway() -> str:
+    # /proc/net/route has the default gateway as little-endian hex in
+    # column 3 of the Destination==00000000 row — a file read instead of
+    # forking `ip`.  Fall back to `ip route` if the parse surprises us.
+    try:
+        with open("/proc/net/route") as fh:
+            next(fh)  # header
+            for line in fh:
+                fields = line.split()
+                if len(fields) >= 3 and fields[1] == "00000000":
+                    gw = int(fields[2], 16)
+                    return ".".join(str((gw >> shift) & 0xFF)
+                                    for shift in (0, 8, 16, 24))
+    except (OSError, ValueError, StopIteration):
+        pass
+    out, _err, rc = run_args(["ip", "route", "show", "default"])
+    if rc == 0 and out.strip():
+        for line in out.splitlines():
+            tok = line.split()
+            if "via" in tok:
+                return tok[tok.index("via") + 1]
+    return "Unknown"
+
+
+def get_dns_servers() -> list:
+    out, _err, rc = run_args([
+        "nmcli", "-t", "-f", "IP4.DNS", "device", "show", "wlan0",
+    ])
+    servers = []
+    if rc == 0:
+        for line in out.splitlines():
+            if "IP4.DNS" in line:
+                v = line.partition(":")[2].strip()
+                if v:
+                    servers.append(v)
+    return servers or ["None configured"]
+
+
+# The full scan forks several external tools; a short TTL stops a
+# repeated status page refresh (or menu redraw) from re-running them all.
+_DIAG_TTL = 2.0
+_diag_cache = {'t': 0.0, 'v': None}
+
+
+def get_full_diagnostics() -> dict:
+    now = time.monotonic()
+    if _diag_cache['v'] is not None and now - _diag_cache['t'] < _DIAG_TTL:
+        return _diag_cache['v']
+    diag = {
+        "interfaces": get_interface_status(),
+        "connection_stats": get_connection_stats(),
+        "gateway": get_gateway(),
+        "dns_servers": get_dns_servers(),
+    }
+    _diag_cache['t'] = now
+    _diag_cache['v'] = diag
+    return diag
@@ -304,6 +304,7 @@ def api_ais_add_endpoint():
     success, endpoint_id, message = add_endpoint(
         data.get('name'), data.get('ip'), data.get('port'),
         bool(data.get('enabled', True)),
+        data.get('protocol', 'tcp'),
     )
     if success and ais_manager.is_running():
         ais_manager.reload_endpoints()
@@ -318,6 +319,7 @@ def api_ais_update_endpoint(endpoint_id):
     success, message = update_endpoint(
         endpoint_id, data.get('name'), data.get('ip'),
         data.get('port'), bool(data.get('enabled', True)),
+        data.get('protocol'),   # None = preserve the stored protocol
     )
     if success and ais_manager.is_running():
         ais_manager.reload_endpoints()
@@ -17,6 +17,7 @@ from __future__ import annotations
 
 import logging
 import os
+import socket
 import sys
 import threading
 import time
@@ -81,32 +82,48 @@ def _print_banner(host: str, port: int):
     log.info("=" * 60)
 
 
-def main():
-    init_db()
+def _pick_port(host: str, port: int) -> int:
+    """Probe-bind the requested port before any heavier startup work.
+
+    Binding a throwaway socket up front answers "can we have port 80?"
+    immediately, so an unprivileged run falls back to 5000 *before* we
+    open the serial port and spin up the forwarder, instead of finding
+    out from waitress after everything else is already running.
+    """
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        probe.bind((host, port))
+        return port
+    except PermissionError:
+        log.error("Cannot bind port %d. Either run with sudo, or grant the "
+                  "venv python: setcap cap_net_bind_service=+ep .venv/bin/python",
+                  port)
+        log.warning("Falling back to port 5000…")
+        return 5000
+    finally:
+        probe.close()
 
+
+def main():
     if hasattr(os, "geteuid") and os.geteuid() != 0:
         log.warning("Not running as root — Wi-Fi reconfiguration may fail.")
 
+    host = os.environ.get("AIS_BIND_HOST", "0.0.0.0")
+    port = _pick_port(host, int(os.environ.get("AIS_BIND_PORT", "80")))
+
+    init_db()
+
     log.info("Starting AIS Manager…")
     ok, msg = ais_manager.start()
     log.info("AIS Manager: %s", msg if ok else f"⚠ {msg}")
 
-    host = os.environ.get("AIS_BIND_HOST", "0.0.0.0")
-    port = int(os.environ.get("AIS_BIND_PORT", "80"))
     _print_banner(host, port)
 
     try:
         serve(app, host=host, port=port,
               threads=8, ident="ais-wifi-manager",
               channel_timeout=120)
-    except PermissionError:
-        log.error("Cannot bind port %d. Either run with sudo, or grant the "
-                  "venv python: setcap cap_net_bind_service=+ep .venv/bin/python",
-                  port)
-        log.warning("Falling back to port 5000…")
-        serve(app, host=host, port=5000,
-              threads=8, ident="ais-wifi-manager",
-              channel_timeout=120)
     except KeyboardInterrupt:
         log.info("Shutting down…")
         ais_manager.stop()